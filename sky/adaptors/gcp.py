@@ -2,6 +2,7 @@
 
 # pylint: disable=import-outside-toplevel
 import json
+import os
 
 from sky.adaptors import common
 
@@ -70,11 +71,19 @@ def credential_error_exception():
 
 @common.load_lazy_modules(_LAZY_MODULES)
 def get_credentials(cred_type: str, credentials_field: str):
-    """Get GCP credentials."""
+    """Get GCP credentials.
+
+    For 'service_account', credentials_field can be either the content or the
+    path of the service account key file.
+    """
     from google.oauth2 import service_account
     from google.oauth2.credentials import Credentials as OAuthCredentials
 
     if cred_type == 'service_account':
+        key_path = os.path.expanduser(credentials_field)
+        if os.path.isfile(key_path):
+            return service_account.Credentials.from_service_account_file(
+                key_path)
         # If parsing the gcp_credentials failed, then the user likely made a
         # mistake in copying the credentials into the config yaml.
         try:
@@ -1,15 +1,22 @@
 """GCP configuration bootstrapping."""
-import copy
+import functools
+import hashlib
 import logging
+import os
+import tempfile
 import time
 import typing
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import cachetools
 
 from sky.adaptors import gcp
 from sky.clouds.utils import gcp_utils
 from sky.provision import common
 from sky.provision.gcp import constants
 from sky.provision.gcp import instance_utils
+from sky.utils import common_utils
+from sky.utils import subprocess_utils
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +45,14 @@ def wait_for_crm_operation(operation, crm):
     logger.info('wait_for_crm_operation: '
                 'Waiting for operation {} to finish...'.format(operation))
 
-    for _ in range(constants.MAX_POLLS):
+    # Most operations finish within a few seconds, so we start polling with a
+    # short interval and back off exponentially, up to the same deadline as
+    # polling MAX_POLLS times with POLL_INTERVAL.
+    backoff = common_utils.Backoff(
+        initial_backoff=constants.OPERATION_POLL_INITIAL_BACKOFF_SECONDS,
+        max_backoff_factor=constants.OPERATION_POLL_MAX_BACKOFF_FACTOR)
+    deadline = time.time() + constants.MAX_POLLS * constants.POLL_INTERVAL
+    while True:
         result = crm.operations().get(name=operation['name']).execute()
         if 'error' in result:
             raise Exception(result['error'])
@@ -47,7 +61,10 @@ def wait_for_crm_operation(operation, crm):
             logger.info('wait_for_crm_operation: Operation done.')
             break
 
-        time.sleep(constants.POLL_INTERVAL)
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(backoff.current_backoff(), remaining))
 
     return result
 
@@ -75,6 +92,62 @@ def wait_for_compute_global_operation(project_name, operation, compute):
     return result
 
 
+class _DiscoveryDiskCache:
+    """Disk cache for the GCP API discovery documents.
+
+    Implements the interface of googleapiclient.discovery_cache.base.Cache.
+    The crm, iam and compute clients are built from the discovery documents
+    bundled with google-api-python-client, so only the TPU client, which is
+    built with a discoveryServiceUrl, downloads its document. This cache lets
+    repeated SkyPilot invocations skip re-downloading that document.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: int) -> None:
+        self._cache_dir = os.path.expanduser(cache_dir)
+        self._ttl_seconds = ttl_seconds
+
+    def _path(self, url: str) -> str:
+        # googleapiclient passes the url the document is fetched from, i.e.,
+        # the discoveryServiceUrl with its placeholders (if any) filled in.
+        # Keying on it keeps documents fetched from different urls apart.
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_dir, f'{url_hash}.json')
+
+    def get(self, url: str):
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self._ttl_seconds:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, url: str, content: str) -> None:
+        # The cache is best-effort. Failing to write should not fail the
+        # client construction.
+        tmp_path = None
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # Write to a temporary file first, so that concurrent readers will
+            # never see a partially written document.
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, self._path(url))
+        except OSError as e:
+            logger.debug(f'Failed to cache GCP discovery document: {e}')
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+_DISCOVERY_CACHE = _DiscoveryDiskCache(constants.DISCOVERY_CACHE_DIR,
+                                       constants.DISCOVERY_CACHE_TTL_SECONDS)
+
+
 def _create_crm(gcp_credentials=None):
     return gcp.build('cloudresourcemanager',
                      'v1',
@@ -101,27 +174,58 @@ def _create_tpu(gcp_credentials=None):
         'tpu',
         constants.TPU_VM_VERSION,
         credentials=gcp_credentials,
-        cache_discovery=False,
+        cache=_DISCOVERY_CACHE,
         discoveryServiceUrl='https://tpu.googleapis.com/$discovery/rest',
     )
 
 
+def _clients_cache_key(cred_type: Optional[str],
+                       credentials_field: Optional[str], has_tpu: bool):
+    # Avoid keeping the raw credentials as the key of the cache.
+    credentials_hash = (None if credentials_field is None else hashlib.sha256(
+        credentials_field.encode('utf-8')).hexdigest())
+    return (cred_type, credentials_hash, has_tpu)
+
+
+# Building the clients parses the discovery documents and constructs all the
+# method bindings, so we reuse the clients across the bootstraps in the same
+# process. The credentials are parsed here and not cached anywhere else, so the
+# TTL also bounds how long rotated credentials keep being used.
+_CLIENTS_CACHE: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=8, ttl=constants.CLIENTS_CACHE_TTL_SECONDS, timer=time.time)
+
+
+@cachetools.cached(cache=_CLIENTS_CACHE, key=_clients_cache_key)
+def _build_clients(cred_type: Optional[str], credentials_field: Optional[str],
+                   has_tpu: bool):
+    credentials = None
+    if cred_type is not None:
+        assert credentials_field is not None
+        credentials = gcp.get_credentials(cred_type, credentials_field)
+    tpu_resource = _create_tpu(credentials) if has_tpu else None
+    return (
+        _create_crm(credentials),
+        _create_iam(credentials),
+        _create_compute(credentials),
+        tpu_resource,
+    )
+
+
 def construct_clients_from_provider_config(provider_config):
     """Attempt to fetch and parse the JSON GCP credentials.
 
     tpu resource (the last element of the tuple) will be None if
     `_has_tpus` in provider config is not set or False.
     """
+    has_tpu = provider_config.get(constants.HAS_TPU_PROVIDER_FIELD, False)
     gcp_credentials = provider_config.get('gcp_credentials')
     if gcp_credentials is None:
         logger.debug('gcp_credentials not found in cluster yaml file. '
                      'Falling back to GOOGLE_APPLICATION_CREDENTIALS '
                      'environment variable.')
-        tpu_resource = (_create_tpu() if provider_config.get(
-            constants.HAS_TPU_PROVIDER_FIELD, False) else None)
         # If gcp_credentials is None, then discovery.build will search for
         # credentials in the local environment.
-        return _create_crm(), _create_iam(), _create_compute(), tpu_resource
+        return _build_clients(None, None, has_tpu)
 
     # Note: The following code has not been used yet, as we will never set
     # `gcp_credentials` in provider_config.
@@ -133,17 +237,7 @@ def construct_clients_from_provider_config(provider_config):
 
     cred_type = gcp_credentials['type']
     credentials_field = gcp_credentials['credentials']
-    credentials = gcp.get_credentials(cred_type, credentials_field)
-
-    tpu_resource = (_create_tpu(credentials) if provider_config.get(
-        constants.HAS_TPU_PROVIDER_FIELD, False) else None)
-
-    return (
-        _create_crm(credentials),
-        _create_iam(credentials),
-        _create_compute(credentials),
-        tpu_resource,
-    )
+    return _build_clients(cred_type, credentials_field, has_tpu)
 
 
 def bootstrap_instances(
@@ -151,12 +245,14 @@ def bootstrap_instances(
         config: common.ProvisionConfig) -> common.ProvisionConfig:
     # Check if we have any TPUs defined, and if so,
     # insert that information into the provider config
-    if instance_utils.get_node_type(
-            config.node_config) == instance_utils.GCPNodeType.TPU:
-        config.provider_config[constants.HAS_TPU_PROVIDER_FIELD] = True
+    provider_config = config.provider_config
+    has_tpu = (instance_utils.get_node_type(
+        config.node_config) == instance_utils.GCPNodeType.TPU)
+    if has_tpu:
+        provider_config[constants.HAS_TPU_PROVIDER_FIELD] = True
 
     crm, iam, compute, _ = construct_clients_from_provider_config(
-        config.provider_config)
+        provider_config)
 
     # Setup a Google Cloud Platform Project.
 
@@ -164,8 +260,8 @@ def bootstrap_instances(
     # buckets, users, and instances under projects. This is different from
     # aws ec2 where everything is global.
 
-    _configure_project(config.provider_config, crm)
-    iam_role = _configure_iam_role(config, crm, iam)
+    _configure_project(provider_config, crm)
+    iam_role = _configure_iam_role(config, crm, iam, has_tpu)
     config.node_config.update(iam_role)
     config = _configure_subnet(region, cluster_name, config, compute)
 
@@ -183,7 +279,7 @@ def _configure_project(provider_config, crm):
     assert project_id is not None, (
         '"project_id" must be set in the "provider" section of the autoscaler'
         ' config. Notice that the project id must be globally unique.')
-    project = _get_project(project_id, crm)
+    project = _get_project(project_id, crm, use_cache=True)
 
     if project is None:
         #  Project not found, try creating it
@@ -198,9 +294,17 @@ def _configure_project(provider_config, crm):
     provider_config['project_id'] = project['projectId']
 
 
-def _is_permission_satisfied(service_account, crm, iam, required_permissions,
-                             required_roles):
-    """Check if either of the roles or permissions are satisfied."""
+def _is_permission_satisfied(service_account,
+                             crm,
+                             iam,
+                             required_permissions,
+                             required_roles,
+                             policy=None):
+    """Check if either of the roles or permissions are satisfied.
+
+    If policy is not None, it should be the IAM policy of the project of the
+    service account, which will be used instead of fetching it again.
+    """
     if service_account is None:
         return False, None
 
@@ -210,8 +314,20 @@ def _is_permission_satisfied(service_account, crm, iam, required_permissions,
     member_id = 'serviceAccount:' + email
 
     required_permissions = set(required_permissions)
-    policy = crm.projects().getIamPolicy(resource=project_id, body={}).execute()
-    original_policy = copy.deepcopy(policy)
+    if policy is None:
+        policy = _get_iam_policy(project_id, crm)
+    # Index the bindings by role in a single pass, so that checking the
+    # required roles does not rescan all the bindings for each role. Multiple
+    # bindings can have the same role, e.g., with different conditions.
+    # We also record the roles originally attached to the member before the
+    # bindings are modified below. This is all the permission check needs, so
+    # we avoid deep copying the whole policy.
+    bindings_by_role: Dict[str, List[Dict[str, Any]]] = {}
+    original_member_roles = []
+    for binding in policy['bindings']:
+        bindings_by_role.setdefault(binding['role'], []).append(binding)
+        if member_id in binding['members']:
+            original_member_roles.append(binding['role'])
     already_configured = True
 
     logger.info(f'_configure_iam_role: Checking permissions for {email}...')
@@ -219,23 +335,24 @@ def _is_permission_satisfied(service_account, crm, iam, required_permissions,
     # Check the roles first, as checking the permission
     # requires more API calls and permissions.
     for role in required_roles:
-        role_exists = False
-        for binding in policy['bindings']:
-            if binding['role'] == role:
-                if member_id not in binding['members']:
-                    logger.info(f'_configure_iam_role: role {role} is not '
-                                f'attached to {member_id}...')
-                    binding['members'].append(member_id)
-                    already_configured = False
-                role_exists = True
-
-        if not role_exists:
+        role_bindings = bindings_by_role.get(role)
+        if role_bindings is None:
             logger.info(f'_configure_iam_role: role {role} does not exist.')
             already_configured = False
-            policy['bindings'].append({
+            new_binding = {
                 'members': [member_id],
                 'role': role,
-            })
+            }
+            policy['bindings'].append(new_binding)
+            bindings_by_role[role] = [new_binding]
+            continue
+
+        for binding in role_bindings:
+            if member_id not in binding['members']:
+                logger.info(f'_configure_iam_role: role {role} is not '
+                            f'attached to {member_id}...')
+                binding['members'].append(member_id)
+                already_configured = False
 
     if already_configured:
         # In some managed environments, an admin needs to grant the
@@ -251,39 +368,36 @@ def _is_permission_satisfied(service_account, crm, iam, required_permissions,
     #    resource=f'projects/{project_id}/serviceAcccounts/{email}').execute()
     # We now skip the check for `iam.serviceAccounts.actAs` permission for
     # simplicity as it can be granted at the service account level.
-    def check_permissions(policy, required_permissions):
-        for binding in policy['bindings']:
-            if member_id in binding['members']:
-                role = binding['role']
-                logger.info(f'_configure_iam_role: role {role} is attached to '
-                            f'{member_id}...')
-                try:
-                    role_definition = iam.projects().roles().get(
-                        name=role).execute()
-                except TypeError as e:
-                    if 'does not match the pattern' in str(e):
-                        logger.info(
-                            '_configure_iam_role: fail to check permission '
-                            f'for built-in role {role}. Fallback to predefined '
-                            'permission list.')
-                        # Built-in roles cannot be checked for permissions with
-                        # the current API, so we fallback to predefined list
-                        # to find the implied permissions.
-                        permissions = constants.BUILTIN_ROLE_TO_PERMISSIONS.get(
-                            role, [])
-                    else:
-                        raise
+    def check_permissions(member_roles, required_permissions):
+        for role in member_roles:
+            logger.info(f'_configure_iam_role: role {role} is attached to '
+                        f'{member_id}...')
+            try:
+                role_definition = iam.projects().roles().get(
+                    name=role).execute()
+            except TypeError as e:
+                if 'does not match the pattern' in str(e):
+                    logger.info('_configure_iam_role: fail to check permission '
+                                f'for built-in role {role}. Fallback to '
+                                'predefined permission list.')
+                    # Built-in roles cannot be checked for permissions with
+                    # the current API, so we fallback to predefined list
+                    # to find the implied permissions.
+                    permissions = constants.BUILTIN_ROLE_TO_PERMISSIONS.get(
+                        role, [])
                 else:
-                    permissions = role_definition['includedPermissions']
-                    logger.info(f'_configure_iam_role: role {role} has '
-                                f'permissions {permissions}.')
-                required_permissions -= set(permissions)
+                    raise
+            else:
+                permissions = role_definition['includedPermissions']
+                logger.info(f'_configure_iam_role: role {role} has '
+                            f'permissions {permissions}.')
+            required_permissions -= set(permissions)
             if not required_permissions:
                 break
         return required_permissions
 
     # Check the permissions
-    required_permissions = check_permissions(original_policy,
+    required_permissions = check_permissions(original_member_roles,
                                              required_permissions)
     if not required_permissions:
         # All required permissions are already granted.
@@ -294,32 +408,67 @@ def _is_permission_satisfied(service_account, crm, iam, required_permissions,
     return False, policy
 
 
-def _configure_iam_role(config: common.ProvisionConfig, crm, iam) -> dict:
+# Memoized formatters of the service account names, which only depend on the
+# project.
+@functools.lru_cache(maxsize=32)
+def _skypilot_service_account_email(project_id: str) -> str:
+    return constants.SKYPILOT_SERVICE_ACCOUNT_EMAIL_TEMPLATE.format(
+        account_id=constants.SKYPILOT_SERVICE_ACCOUNT_ID,
+        project_id=project_id,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _ray_service_account_email(project_id: str) -> str:
+    return constants.SERVICE_ACCOUNT_EMAIL_TEMPLATE.format(
+        account_id=constants.DEFAULT_SERVICE_ACCOUNT_ID,
+        project_id=project_id,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _service_account_full_name(project_id: str, account: str) -> str:
+    return f'projects/{project_id}/serviceAccounts/{account}'
+
+
+def _configure_iam_role(config: common.ProvisionConfig, crm, iam,
+                        has_tpu: bool) -> dict:
     """Setup a gcp service account with IAM roles.
 
     Creates a gcp service acconut and binds IAM roles which allow it to control
     control storage/compute services. Specifically, the head node needs to have
     an IAM role that allows it to create further gce instances and store items
-    in google cloud storage.
+    in google cloud storage. has_tpu is whether the node is a TPU.
 
     TODO: Allow the name/id of the service account to be configured
     """
     project_id = config.provider_config['project_id']
-    email = constants.SKYPILOT_SERVICE_ACCOUNT_EMAIL_TEMPLATE.format(
-        account_id=constants.SKYPILOT_SERVICE_ACCOUNT_ID,
-        project_id=project_id,
-    )
-    service_account = _get_service_account(email, project_id, iam)
+    email = _skypilot_service_account_email(project_id)
+    # The service account and the IAM policy of the project are independent,
+    # so we fetch them in parallel to save a round-trip. The IAM APIs do not
+    # share a batch endpoint with the resource manager APIs, so they cannot be
+    # combined into a single batch request. If the service account does not
+    # exist, the prefetched policy is not used.
+    service_account, policy = subprocess_utils.run_in_parallel(
+        lambda fetch_fn: fetch_fn(), [
+            lambda: _get_service_account(email, project_id, iam),
+            lambda: _prefetch_iam_policy(project_id, crm),
+        ],
+        num_threads=2)
 
     permissions = gcp_utils.get_minimal_permissions()
     roles = constants.DEFAULT_SERVICE_ACCOUNT_ROLES
-    if config.provider_config.get(constants.HAS_TPU_PROVIDER_FIELD, False):
+    if has_tpu:
         roles = (constants.DEFAULT_SERVICE_ACCOUNT_ROLES +
                  constants.TPU_SERVICE_ACCOUNT_ROLES)
         permissions = (permissions + constants.TPU_MINIMAL_PERMISSIONS)
 
+    if (service_account is None or service_account['projectId'] != project_id):
+        # The prefetched policy is only valid for the service account in the
+        # same project.
+        policy = None
     satisfied, policy = _is_permission_satisfied(service_account, crm, iam,
-                                                 permissions, roles)
+                                                 permissions, roles, policy)
 
     if not satisfied:
         # SkyPilot: Fallback to the old ray service account name for
@@ -328,10 +477,7 @@ def _configure_iam_role(config: common.ProvisionConfig, crm, iam) -> dict:
         # and the user may not have the permissions to create the
         # new service account. This is to ensure that the old service
         # account is still usable.
-        email = constants.SERVICE_ACCOUNT_EMAIL_TEMPLATE.format(
-            account_id=constants.DEFAULT_SERVICE_ACCOUNT_ID,
-            project_id=project_id,
-        )
+        email = _ray_service_account_email(project_id)
         logger.info(f'_configure_iam_role: Fallback to service account {email}')
 
         ray_service_account = _get_service_account(email, project_id, iam)
@@ -375,8 +521,7 @@ def _configure_iam_role(config: common.ProvisionConfig, crm, iam) -> dict:
         'scopes': ['https://www.googleapis.com/auth/cloud-platform'],
     }
     iam_role: Dict[str, Any]
-    if (instance_utils.get_node_type(
-            config.node_config) == instance_utils.GCPNodeType.TPU):
+    if has_tpu:
         # SKY: The API for TPU VM is slightly different from normal compute
         # instances.
         # See https://cloud.google.com/tpu/docs/reference/rest/v2alpha1/projects.locations.nodes#Node # pylint: disable=line-too-long
@@ -392,7 +537,8 @@ def _configure_iam_role(config: common.ProvisionConfig, crm, iam) -> dict:
 def _check_firewall_rules(cluster_name: str, vpc_name: str, project_id: str,
                           compute):
     """Check if the firewall rules in the VPC are sufficient."""
-    required_rules = constants.FIREWALL_RULES_REQUIRED.copy()
+    # The required rules are only read below, so no copy is needed.
+    required_rules = constants.FIREWALL_RULES_REQUIRED
 
     operation = compute.networks().getEffectiveFirewalls(project=project_id,
                                                          network=vpc_name)
@@ -456,9 +602,8 @@ def _check_firewall_rules(cluster_name: str, vpc_name: str, project_id: str,
             sources = rule.get('sourceRanges', [])
             allowed = rule.get('allowed', [])
             for source in sources:
-                key = (direction, source)
-                source2allowed_list[key] = source2allowed_list.get(key,
-                                                                   []) + allowed
+                source2allowed_list.setdefault((direction, source),
+                                               []).extend(allowed)
         for direction_source, allowed_list in source2allowed_list.items():
             source2rules[direction_source] = {}
             for allowed in allowed_list:
@@ -559,7 +704,8 @@ def get_usable_vpc_and_subnet(
         RuntimeError: if the user has specified a VPC name but the VPC is not
         found.
     """
-    project_id = config.provider_config['project_id']
+    provider_config = config.provider_config
+    project_id = provider_config['project_id']
 
     # For existing cluster, it is ok to return a VPC and subnet not used by
     # the cluster, as AWS will ignore them.
@@ -569,7 +715,7 @@ def get_usable_vpc_and_subnet(
     # not handle this special case as we don't want to sacrifice the performance
     # for every launch just for this rare case.
 
-    specific_vpc_to_use = config.provider_config.get('vpc_name', None)
+    specific_vpc_to_use = provider_config.get('vpc_name', None)
     if specific_vpc_to_use is not None:
         vpcnets_all = _list_vpcnets(project_id,
                                     compute,
@@ -630,6 +776,8 @@ def get_usable_vpc_and_subnet(
         body['selfLink'] = body['selfLink'].format(
             PROJ_ID=project_id, VPC_NAME=constants.SKYPILOT_VPC_NAME)
         _create_vpcnet(project_id, compute, body)
+        # The new VPC comes with new subnets.
+        _SUBNETS_CACHE.clear()
 
     _create_rules(project_id, compute, constants.FIREWALL_RULES_TEMPLATE,
                   constants.SKYPILOT_VPC_NAME)
@@ -665,37 +813,51 @@ def _configure_subnet(region: str, cluster_name: str,
     _, default_subnet = get_usable_vpc_and_subnet(cluster_name, region, config,
                                                   compute)
 
-    default_interfaces = [{
-        'subnetwork': default_subnet['selfLink'],
-        'accessConfigs': [{
-            'name': 'External NAT',
-            'type': 'ONE_TO_ONE_NAT',
-        }],
-    }]
+    subnet_link = default_subnet['selfLink']
     enable_external_ips = _enable_external_ips(config)
-    if not enable_external_ips:
-        # Removing this key means the VM will not be assigned an external IP.
-        default_interfaces[0].pop('accessConfigs')
 
     # The not applicable key will be removed during node creation
 
     # compute
     if 'networkInterfaces' not in node_config:
-        node_config['networkInterfaces'] = copy.deepcopy(default_interfaces)
+        node_config['networkInterfaces'] = _make_compute_network_interfaces(
+            subnet_link, enable_external_ips)
     # TPU
     if 'networkConfig' not in node_config:
-        node_config['networkConfig'] = copy.deepcopy(default_interfaces)[0]
-        # TPU doesn't have accessConfigs
-        node_config['networkConfig'].pop('accessConfigs', None)
-        node_config['networkConfig']['enableExternalIps'] = enable_external_ips
+        node_config['networkConfig'] = _make_tpu_network_config(
+            subnet_link, enable_external_ips)
 
     return config
 
 
+def _make_compute_network_interfaces(
+        subnet_link: str, enable_external_ips: bool) -> List[Dict[str, Any]]:
+    """Returns a new networkInterfaces field for a compute instance."""
+    interface: Dict[str, Any] = {'subnetwork': subnet_link}
+    # Without accessConfigs, the VM will not be assigned an external IP.
+    if enable_external_ips:
+        interface['accessConfigs'] = [{
+            'name': 'External NAT',
+            'type': 'ONE_TO_ONE_NAT',
+        }]
+    return [interface]
+
+
+def _make_tpu_network_config(subnet_link: str,
+                             enable_external_ips: bool) -> Dict[str, Any]:
+    """Returns a new networkConfig field for a TPU node."""
+    # TPU doesn't have accessConfigs
+    return {
+        'subnetwork': subnet_link,
+        'enableExternalIps': enable_external_ips,
+    }
+
+
 def _enable_external_ips(config: common.ProvisionConfig) -> bool:
-    force_enable_external_ips = config.provider_config.get(
-        'force_enable_external_ips', False)
-    use_internal_ips = config.provider_config.get('use_internal_ips', False)
+    provider_config = config.provider_config
+    force_enable_external_ips = provider_config.get('force_enable_external_ips',
+                                                    False)
+    use_internal_ips = provider_config.get('use_internal_ips', False)
 
     return force_enable_external_ips or not use_internal_ips
 
@@ -729,24 +891,45 @@ def _list_vpcnets(project_id: str, compute, filter=None):  # pylint: disable=red
         filter=filter,
     ).execute())
 
-    return (list(sorted(response['items'], key=lambda x: x['name']))
+    return (sorted(response['items'], key=lambda x: x['name'])
             if 'items' in response else [])
 
 
+# The subnets of a project rarely change, so we cache the list of subnets in
+# each region to avoid the round-trip on every bootstrap. The cache is cleared
+# when SkyPilot creates a new VPC, and _list_subnets refetches the subnets
+# before reporting that a VPC has no subnet in the region, as the VPC or the
+# subnet may have been created by others after the subnets were cached.
+_SUBNETS_CACHE: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=16, ttl=constants.SUBNETS_CACHE_TTL_SECONDS, timer=time.time)
+
+
+def _subnets_cache_key(project_id: str, region: str, compute):
+    del compute  # Unused.
+    return (project_id, region)
+
+
+@cachetools.cached(cache=_SUBNETS_CACHE, key=_subnets_cache_key)
+def _list_all_subnets(
+        project_id: str, region: str,
+        compute) -> List['google.cloud.compute_v1.types.compute.Subnetwork']:
+    response = (compute.subnetworks().list(
+        project=project_id,
+        region=region,
+    ).execute())
+    return response['items'] if 'items' in response else []
+
+
 def _list_subnets(
         project_id: str,
         region: str,
         compute,
         network=None
 ) -> List['google.cloud.compute_v1.types.compute.Subnetwork']:
-    response = (compute.subnetworks().list(
-        project=project_id,
-        region=region,
-    ).execute())
-
-    items = response['items'] if 'items' in response else []
+    items = _list_all_subnets(project_id, region, compute)
     if network is None:
-        return items
+        # Copy the list, as the cached one should not be modified.
+        return list(items)
 
     # Filter by network (VPC) name.
     #
@@ -754,6 +937,21 @@ def _list_subnets(
     # call above, because it'd involve constructing a long URL of the following
     # format and passing it as the filter value:
     # 'https://www.googleapis.com/compute/v1/projects/<project_id>/global/networks/<network_name>' # pylint: disable=line-too-long
+    matched_items = _filter_subnets_by_network(items, network)
+    if not matched_items:
+        # The cached subnets can be stale, so refetch them before the caller
+        # fails over to other regions.
+        _SUBNETS_CACHE.pop(_subnets_cache_key(project_id, region, compute),
+                           None)
+        items = _list_all_subnets(project_id, region, compute)
+        matched_items = _filter_subnets_by_network(items, network)
+    return matched_items
+
+
+def _filter_subnets_by_network(
+    items: List['google.cloud.compute_v1.types.compute.Subnetwork'],
+    network: str,
+) -> List['google.cloud.compute_v1.types.compute.Subnetwork']:
     matched_items = []
     for item in items:
         if network == _network_interface_to_vpc_name(item):
@@ -761,7 +959,20 @@ def _list_subnets(
     return matched_items
 
 
-def _get_project(project_id: str, crm):
+# Project ID -> (timestamp, project) for the active projects fetched by
+# _get_project.
+_PROJECT_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _get_project(project_id: str,
+                 crm,
+                 use_cache: bool = False) -> Optional[Dict[str, Any]]:
+    cache_enabled = os.environ.get(constants.CACHE_PROJECT_ENV_VAR, '0') == '1'
+    if cache_enabled and use_cache and project_id in _PROJECT_CACHE:
+        cached_time, cached_project = _PROJECT_CACHE[project_id]
+        if time.time() - cached_time < constants.PROJECT_CACHE_TTL_SECONDS:
+            return cached_project
+    _PROJECT_CACHE.pop(project_id, None)
     try:
         project = crm.projects().get(projectId=project_id).execute()
     except gcp.http_error_exception() as e:
@@ -769,6 +980,11 @@ def _get_project(project_id: str, crm):
             raise
         project = None
 
+    # Only cache the active projects, so that a project in other states will
+    # be checked again in the next bootstrap.
+    if (cache_enabled and project is not None and
+            project.get('lifecycleState') == 'ACTIVE'):
+        _PROJECT_CACHE[project_id] = (time.time(), project)
     return project
 
 
@@ -783,9 +999,25 @@ def _create_project(project_id: str, crm):
     return result
 
 
+def _get_iam_policy(project_id: str, crm):
+    return crm.projects().getIamPolicy(resource=project_id, body={}).execute()
+
+
+def _prefetch_iam_policy(project_id: str, crm):
+    """Returns the IAM policy of the project, or None if it failed to fetch.
+
+    The failure is left to the later permission check, where the policy will be
+    fetched again, so that the behavior is the same as not prefetching.
+    """
+    try:
+        return _get_iam_policy(project_id, crm)
+    except gcp.http_error_exception() as e:
+        logger.debug(f'Failed to prefetch the IAM policy of {project_id}: {e}')
+        return None
+
+
 def _get_service_account(account: str, project_id: str, iam):
-    full_name = 'projects/{project_id}/serviceAccounts/{account}'.format(
-        project_id=project_id, account=account)
+    full_name = _service_account_full_name(project_id, account)
     try:
         service_account = iam.projects().serviceAccounts().get(
             name=full_name).execute()
@@ -818,6 +1050,11 @@ def _add_iam_policy_binding(service_account, policy, crm, iam):
     del iam
     project_id = service_account['projectId']
 
+    # The policy is the one returned by getIamPolicy, with the new bindings
+    # added by _is_permission_satisfied, which only returns an unsatisfied
+    # result when the bindings have been changed. The policy keeps its etag, so
+    # setIamPolicy will fail on a concurrent modification of the policy instead
+    # of overwriting it.
     result = (crm.projects().setIamPolicy(
         resource=project_id,
         body={
@@ -214,6 +214,26 @@ POLL_INTERVAL = 1
 MAX_POLLS = 60 // POLL_INTERVAL
 # Stopping instances can take several minutes, so we increase the timeout
 MAX_POLLS_STOP = MAX_POLLS * 8
+# Backoff for polling the operations that usually finish quickly, with a
+# deadline of MAX_POLLS * POLL_INTERVAL. The interval starts at about 0.2
+# seconds and grows up to about 2.8 seconds, as common_utils.Backoff adds up to
+# 40% jitter after capping the backoff at 2 seconds.
+OPERATION_POLL_INITIAL_BACKOFF_SECONDS = 0.2
+OPERATION_POLL_MAX_BACKOFF_FACTOR = 10
+
+# Local cache for the GCP API discovery documents, used when building the API
+# clients for provisioning.
+DISCOVERY_CACHE_DIR = '~/.sky/gcp_discovery'
+DISCOVERY_CACHE_TTL_SECONDS = 24 * 60 * 60  # 1 day
+# How long the API clients built for provisioning are reused in a process.
+CLIENTS_CACHE_TTL_SECONDS = 30 * 60  # 30 minutes
+# Set this env var to 1 to reuse the project fetched within
+# PROJECT_CACHE_TTL_SECONDS in the same process, instead of querying it in every
+# bootstrap.
+CACHE_PROJECT_ENV_VAR = 'SKYPILOT_GCP_CACHE_PROJECT'
+PROJECT_CACHE_TTL_SECONDS = 10 * 60  # 10 minutes
+# How long the subnets listed in a region are reused in a process.
+SUBNETS_CACHE_TTL_SECONDS = 5 * 60  # 5 minutes
 
 # MIG constants
 MANAGED_INSTANCE_GROUP_CONFIG = 'managed-instance-group'
@@ -1657,6 +1657,14 @@ class GCPNodeType(enum.Enum):
     TPU = 'tpu'
 
 
+def _is_tpu_node(config: Dict[str, Any]) -> bool:
+    """Returns whether the node ``config`` is a TPU, without validating it.
+
+    See get_node_type for the rules.
+    """
+    return 'machineType' not in config and 'acceleratorType' in config
+
+
 def get_node_type(config: Dict[str, Any]) -> GCPNodeType:
     """Returns node type based on the keys in ``node``.
 
@@ -1675,7 +1683,7 @@ def get_node_type(config: Dict[str, Any]) -> GCPNodeType:
             'is required. '
             f'Got {list(config)}')
 
-    if 'machineType' not in config and 'acceleratorType' in config:
+    if _is_tpu_node(config):
         return GCPNodeType.TPU
 
     if (config.get(constants.MANAGED_INSTANCE_GROUP_CONFIG, None) is not None
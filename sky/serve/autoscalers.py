@@ -1,11 +1,11 @@
 """Autoscalers: perform autoscaling by monitoring metrics."""
-import bisect
+import collections
 import dataclasses
 import enum
 import math
 import time
 import typing
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Deque, Dict, Iterable, List, Optional, Union
 
 from sky import sky_logging
 from sky.serve import constants
@@ -18,6 +18,15 @@ if typing.TYPE_CHECKING:
 
 logger = sky_logging.init_logger(__name__)
 
+# The statuses of the replicas that can be scaled down, mapped to their order of
+# preference to be scaled down. Computed once, as they are used in every
+# autoscaling decision.
+_SCALE_DOWN_STATUS_TO_ORDER = {
+    status: order for order, status in enumerate(
+        serve_state.ReplicaStatus.scale_down_decision_order())
+}
+_TERMINAL_STATUSES = frozenset(serve_state.ReplicaStatus.terminal_statuses())
+
 
 class AutoscalerDecisionOperator(enum.Enum):
     SCALE_UP = 'scale_up'
@@ -36,6 +45,11 @@ class AutoscalerDecision:
     | SCALE_DOWN | int                       | Replica id to remove          |
     |------------------------------------------------------------------------|
     """
+    # Decisions are created for every replica to scale in each evaluation, so
+    # we use slots to avoid the per-instance __dict__. (dataclass(slots=True)
+    # requires Python 3.10.)
+    __slots__ = ('operator', 'target')
+
     operator: AutoscalerDecisionOperator
     target: Union[Optional[Dict[str, Any]], int]
 
@@ -167,7 +181,9 @@ class RequestRateAutoscaler(Autoscaler):
         self.target_qps_per_replica: Optional[
             float] = spec.target_qps_per_replica
         self.qps_window_size: int = constants.AUTOSCALER_QPS_WINDOW_SIZE_SECONDS
-        self.request_timestamps: List[float] = []
+        self._num_requests_per_replica_in_window: Optional[int] = (
+            self._get_num_requests_per_replica_in_window())
+        self.request_timestamps: Deque[float] = collections.deque()
         self.upscale_counter: int = 0
         self.downscale_counter: int = 0
         upscale_delay_seconds = (
@@ -184,14 +200,30 @@ class RequestRateAutoscaler(Autoscaler):
             downscale_delay_seconds /
             constants.AUTOSCALER_DEFAULT_DECISION_INTERVAL_SECONDS)
 
+    def _get_num_requests_per_replica_in_window(self) -> Optional[int]:
+        """Returns the target number of requests per replica in the window.
+
+        Only available when target_qps_per_replica is an integer, so that the
+        target number of replicas can be calculated with integer arithmetic.
+        """
+        if not isinstance(self.target_qps_per_replica, int):
+            return None
+        return self.qps_window_size * self.target_qps_per_replica
+
     def _cal_target_num_replicas_based_on_qps(self) -> int:
         # Recalculate target_num_replicas based on QPS.
         # Reclip self.target_num_replicas with new min and max replicas.
         if self.target_qps_per_replica is None:
             return self.min_replicas
-        target_num_replicas = math.ceil(
-            len(self.request_timestamps) / self.qps_window_size /
-            self.target_qps_per_replica)
+        num_requests = len(self.request_timestamps)
+        num_requests_per_replica = self._num_requests_per_replica_in_window
+        if num_requests_per_replica is not None:
+            # Ceiling division.
+            target_num_replicas = -(-num_requests // num_requests_per_replica)
+        else:
+            target_num_replicas = math.ceil(num_requests /
+                                            self.qps_window_size /
+                                            self.target_qps_per_replica)
         return max(self.min_replicas, min(self.max_replicas,
                                           target_num_replicas))
 
@@ -199,6 +231,8 @@ class RequestRateAutoscaler(Autoscaler):
                        update_mode: serve_utils.UpdateMode) -> None:
         super().update_version(version, spec, update_mode)
         self.target_qps_per_replica = spec.target_qps_per_replica
+        self._num_requests_per_replica_in_window = (
+            self._get_num_requests_per_replica_in_window())
         upscale_delay_seconds = (
             spec.upscale_delay_seconds if spec.upscale_delay_seconds is not None
             else constants.AUTOSCALER_DEFAULT_UPSCALE_DELAY_SECONDS)
@@ -231,14 +265,15 @@ class RequestRateAutoscaler(Autoscaler):
             'timestamps': [timestamp1 (float), timestamp2 (float), ...]
         }
         """
-        self.request_timestamps.extend(
-            request_aggregator_info.get('timestamps', []))
-        current_time = time.time()
-        index = bisect.bisect_left(self.request_timestamps,
-                                   current_time - self.qps_window_size)
-        self.request_timestamps = self.request_timestamps[index:]
-        logger.info(f'Num of requests in the last {self.qps_window_size} '
-                    f'seconds: {len(self.request_timestamps)}')
+        request_timestamps = self.request_timestamps
+        request_timestamps.extend(request_aggregator_info.get('timestamps', []))
+        # The timestamps are in ascending order, so we evict the ones out of the
+        # window from the left, without copying the remaining timestamps.
+        window_start = time.time() - self.qps_window_size
+        while request_timestamps and request_timestamps[0] < window_start:
+            request_timestamps.popleft()
+        logger.info('Num of requests in the last %d seconds: %d',
+                    self.qps_window_size, len(request_timestamps))
 
     def _set_target_num_replica_with_hysteresis(self) -> None:
         """Set target_num_replicas based on request rate with hysteresis."""
@@ -273,38 +308,43 @@ class RequestRateAutoscaler(Autoscaler):
         num_requests_per_second = len(
             self.request_timestamps) / self.qps_window_size
         logger.info(
-            f'Requests per second: {num_requests_per_second}. '
-            f'Current target number of replicas: {old_target_num_replicas}. '
-            f'Final target number of replicas: {self.target_num_replicas}. '
-            f'Upscale counter: {self.upscale_counter}/'
-            f'{self.scale_up_consecutive_periods}. '
-            f'Downscale counter: {self.downscale_counter}/'
-            f'{self.scale_down_consecutive_periods}')
+            'Requests per second: %s. '
+            'Current target number of replicas: %d. '
+            'Final target number of replicas: %d. '
+            'Upscale counter: %d/%d. '
+            'Downscale counter: %d/%d', num_requests_per_second,
+            old_target_num_replicas, self.target_num_replicas,
+            self.upscale_counter, self.scale_up_consecutive_periods,
+            self.downscale_counter, self.scale_down_consecutive_periods)
 
     @classmethod
     def _select_nonterminal_replicas_to_scale_down(
             cls, num_limit: int,
             replica_infos: Iterable['replica_managers.ReplicaInfo']
     ) -> List[int]:
-        status_order = serve_state.ReplicaStatus.scale_down_decision_order()
         replicas = list(replica_infos)
-        assert all(info.status in status_order for info in replicas), (
-            'All replicas to scale down should be in provisioning or launched '
-            'status.', replicas)
-        replicas = sorted(
-            replicas,
-            key=lambda info: (
-                status_order.index(info.status),
+        # Build the sort keys directly, so that the status of each replica is
+        # only computed once and its order is a dict lookup.
+        keyed_replica_ids = []
+        for info in replicas:
+            status_order = _SCALE_DOWN_STATUS_TO_ORDER.get(info.status)
+            assert status_order is not None, (
+                'All replicas to scale down should be in provisioning or '
+                'launched status.', replicas)
+            sort_key = (
+                status_order,
                 # Sort by version in ascending order, so we scale down the older
                 # versions first.
                 info.version,
                 # Sort `info.replica_id` in descending order so that the
                 # replicas in the same version starts to provisioning later are
                 # scaled down first.
-                -info.replica_id))
-        assert len(replicas) >= num_limit, (
+                -info.replica_id)
+            keyed_replica_ids.append((sort_key, info.replica_id))
+        assert len(keyed_replica_ids) >= num_limit, (
             'Not enough replicas to scale down.', replicas, num_limit)
-        return [info.replica_id for info in replicas][:num_limit]
+        keyed_replica_ids.sort()
+        return [replica_id for _, replica_id in keyed_replica_ids[:num_limit]]
 
     def get_decision_interval(self) -> int:
         # Reduce autoscaler interval when target_num_replicas = 0.
@@ -396,24 +436,37 @@ class RequestRateAutoscaler(Autoscaler):
         override dict. Active migration could require returning both SCALE_UP
         and SCALE_DOWN.
         """
-        latest_replicas: List['replica_managers.ReplicaInfo'] = []
         latest_nonterminal_replicas: List['replica_managers.ReplicaInfo'] = []
-
+        # Whether any replica of the latest version failed unrecoverably,
+        # recorded in the same pass as collecting the nonterminal replicas.
+        latest_unrecoverable_failure = False
+
+        # Bind the attributes to locals, as they are accessed for every
+        # replica. `info.status` is computed from the status property on every
+        # access, so we only get it once per replica.
+        latest_version = self.latest_version
+        ready_status = serve_state.ReplicaStatus.READY
         for info in replica_infos:
-            if info.version == self.latest_version:
-                latest_replicas.append(info)
-                if not info.is_terminal:
-                    latest_nonterminal_replicas.append(info)
-                    if info.is_ready:
-                        self.latest_version_ever_ready = self.latest_version
-        if self.latest_version_ever_ready < self.latest_version:
-            for info in latest_replicas:
-                if info.status_property.unrecoverable_failure():
-                    # Stop scaling if one of replica of the latest version
-                    # failed, it is likely that a fatal error happens to the
-                    # user application and may lead to a infinte termination
-                    # and restart.
-                    return []
+            if info.version != latest_version:
+                continue
+            status = info.status
+            if status not in _TERMINAL_STATUSES:
+                latest_nonterminal_replicas.append(info)
+                if status == ready_status:
+                    self.latest_version_ever_ready = latest_version
+            elif (not latest_unrecoverable_failure and
+                  self.latest_version_ever_ready < latest_version):
+                # Only terminal replicas can fail unrecoverably. The check is
+                # not needed once the latest version has been ready.
+                latest_unrecoverable_failure = (
+                    info.status_property.unrecoverable_failure())
+        if (self.latest_version_ever_ready < self.latest_version and
+                latest_unrecoverable_failure):
+            # Stop scaling if one of replica of the latest version
+            # failed, it is likely that a fatal error happens to the
+            # user application and may lead to a infinte termination
+            # and restart.
+            return []
 
         self._set_target_num_replica_with_hysteresis()
 
@@ -434,8 +487,8 @@ class RequestRateAutoscaler(Autoscaler):
         if len(latest_nonterminal_replicas) < self.target_num_replicas:
             num_replicas_to_scale_up = (self.target_num_replicas -
                                         len(latest_nonterminal_replicas))
-            logger.info('Number of replicas to scale up: '
-                        f'{num_replicas_to_scale_up}')
+            logger.info('Number of replicas to scale up: %d',
+                        num_replicas_to_scale_up)
             for _ in range(num_replicas_to_scale_up):
                 scaling_options.append(
                     AutoscalerDecision(AutoscalerDecisionOperator.SCALE_UP,
@@ -451,9 +504,8 @@ class RequestRateAutoscaler(Autoscaler):
                 _select_nonterminal_replicas_to_scale_down(
                     num_limit=num_replicas_to_scale_down,
                     replica_infos=latest_nonterminal_replicas))
-            logger.info(
-                'Number of replicas to scale down: '
-                f'{num_replicas_to_scale_down} {replicas_to_scale_down}')
+            logger.info('Number of replicas to scale down: %d %s',
+                        num_replicas_to_scale_down, replicas_to_scale_down)
             all_replica_ids_to_scale_down.extend(replicas_to_scale_down)
 
         for replica_id in all_replica_ids_to_scale_down:
@@ -467,14 +519,15 @@ class RequestRateAutoscaler(Autoscaler):
 
     def _dump_dynamic_states(self) -> Dict[str, Any]:
         return {
-            'request_timestamps': self.request_timestamps,
+            'request_timestamps': list(self.request_timestamps),
         }
 
     def _load_dynamic_states(self, dynamic_states: Dict[str, Any]) -> None:
         if 'request_timestamps' in dynamic_states:
-            self.request_timestamps = dynamic_states.pop('request_timestamps')
+            self.request_timestamps = collections.deque(
+                dynamic_states.pop('request_timestamps'))
         if dynamic_states:
-            logger.info(f'Remaining dynamic states: {dynamic_states}')
+            logger.info('Remaining dynamic states: %s', dynamic_states)
 
 
 class FallbackRequestRateAutoscaler(RequestRateAutoscaler):
@@ -530,32 +583,40 @@ class FallbackRequestRateAutoscaler(RequestRateAutoscaler):
         replica_infos: List['replica_managers.ReplicaInfo'],
     ) -> List[AutoscalerDecision]:
 
-        latest_nonterminal_replicas = list(
-            filter(
-                lambda info: not info.is_terminal and info.version == self.
-                latest_version, replica_infos))
-
         self._set_target_num_replica_with_hysteresis()
-        num_nonterminal_spot, num_ready_spot = 0, 0
-        num_nonterminal_ondemand, num_ready_ondemand = 0, 0
 
-        for info in latest_nonterminal_replicas:
+        # Classify the nonterminal replicas of the latest version into spot
+        # and on-demand, and count the ready ones, in a single pass.
+        latest_nonterminal_spot: List['replica_managers.ReplicaInfo'] = []
+        latest_nonterminal_ondemand: List['replica_managers.ReplicaInfo'] = []
+        num_ready_spot, num_ready_ondemand = 0, 0
+        # See RequestRateAutoscaler.evaluate_scaling for the local bindings.
+        latest_version = self.latest_version
+        ready_status = serve_state.ReplicaStatus.READY
+        for info in replica_infos:
+            if info.version != latest_version:
+                continue
+            status = info.status
+            if status in _TERMINAL_STATUSES:
+                continue
+            is_ready = status == ready_status
             if info.is_spot:
-                if info.status == serve_state.ReplicaStatus.READY:
+                latest_nonterminal_spot.append(info)
+                if is_ready:
                     num_ready_spot += 1
-                num_nonterminal_spot += 1
             else:
-                if info.status == serve_state.ReplicaStatus.READY:
+                latest_nonterminal_ondemand.append(info)
+                if is_ready:
                     num_ready_ondemand += 1
-                num_nonterminal_ondemand += 1
+        num_nonterminal_spot = len(latest_nonterminal_spot)
+        num_nonterminal_ondemand = len(latest_nonterminal_ondemand)
 
         logger.info(
-            'Number of alive spot instances: '
-            f'{num_nonterminal_spot}, '
-            f'Number of ready spot instances: {num_ready_spot}, '
-            'Number of alive on-demand instances: '
-            f' {num_nonterminal_ondemand}, '
-            f'Number of ready on-demand instances: {num_ready_ondemand}')
+            'Number of alive spot instances: %d, '
+            'Number of ready spot instances: %d, '
+            'Number of alive on-demand instances: %d, '
+            'Number of ready on-demand instances: %d', num_nonterminal_spot,
+            num_ready_spot, num_nonterminal_ondemand, num_ready_ondemand)
 
         scaling_options: List[AutoscalerDecision] = []
         all_replica_ids_to_scale_down: List[int] = []
@@ -573,13 +634,15 @@ class FallbackRequestRateAutoscaler(RequestRateAutoscaler):
             # Not enough spot instances, scale up.
             num_spot_to_scale_up = (num_spot_to_provision -
                                     num_nonterminal_spot)
-            logger.info('Number of spot instances to scale up: '
-                        f'{num_spot_to_scale_up}')
+            logger.info('Number of spot instances to scale up: %d',
+                        num_spot_to_scale_up)
+            # The override is only read downstream, so all the scale up
+            # decisions share one dict.
+            spot_override = self._get_spot_resources_override_dict()
             for _ in range(num_spot_to_scale_up):
                 scaling_options.append(
-                    AutoscalerDecision(
-                        AutoscalerDecisionOperator.SCALE_UP,
-                        target=self._get_spot_resources_override_dict()))
+                    AutoscalerDecision(AutoscalerDecisionOperator.SCALE_UP,
+                                       target=spot_override))
         elif num_nonterminal_spot > num_spot_to_provision:
             # Too many spot instances, scale down.
             # Get the replica to scale down with _select_replicas_to_scale_down
@@ -588,11 +651,9 @@ class FallbackRequestRateAutoscaler(RequestRateAutoscaler):
             replicas_to_scale_down = (
                 RequestRateAutoscaler.
                 _select_nonterminal_replicas_to_scale_down(
-                    num_spot_to_scale_down,
-                    filter(lambda info: info.is_spot,
-                           latest_nonterminal_replicas)))
-            logger.info('Number of spot instances to scale down: '
-                        f'{num_spot_to_scale_down} {replicas_to_scale_down}')
+                    num_spot_to_scale_down, latest_nonterminal_spot))
+            logger.info('Number of spot instances to scale down: %d %s',
+                        num_spot_to_scale_down, replicas_to_scale_down)
             all_replica_ids_to_scale_down.extend(replicas_to_scale_down)
 
         # Decide how many on-demand instances to launch.
@@ -608,25 +669,22 @@ class FallbackRequestRateAutoscaler(RequestRateAutoscaler):
         if num_ondemand_to_provision > num_nonterminal_ondemand:
             num_ondemand_to_scale_up = (num_ondemand_to_provision -
                                         num_nonterminal_ondemand)
-            logger.info('Number of on-demand instances to scale up: '
-                        f'{num_ondemand_to_scale_up}')
+            logger.info('Number of on-demand instances to scale up: %d',
+                        num_ondemand_to_scale_up)
+            ondemand_override = self._get_ondemand_resources_override_dict()
             for _ in range(num_ondemand_to_scale_up):
                 scaling_options.append(
-                    AutoscalerDecision(
-                        AutoscalerDecisionOperator.SCALE_UP,
-                        target=self._get_ondemand_resources_override_dict()))
+                    AutoscalerDecision(AutoscalerDecisionOperator.SCALE_UP,
+                                       target=ondemand_override))
         else:
             num_ondemand_to_scale_down = (num_nonterminal_ondemand -
                                           num_ondemand_to_provision)
             replicas_to_scale_down = (
                 RequestRateAutoscaler.
                 _select_nonterminal_replicas_to_scale_down(
-                    num_ondemand_to_scale_down,
-                    filter(lambda info: not info.is_spot,
-                           latest_nonterminal_replicas)))
-            logger.info(
-                'Number of on-demand instances to scale down: '
-                f'{num_ondemand_to_scale_down} {replicas_to_scale_down}')
+                    num_ondemand_to_scale_down, latest_nonterminal_ondemand))
+            logger.info('Number of on-demand instances to scale down: %d %s',
+                        num_ondemand_to_scale_down, replicas_to_scale_down)
 
             all_replica_ids_to_scale_down.extend(replicas_to_scale_down)
 
@@ -1,9 +1,19 @@
+import copy
+import hashlib
+import json
+import os
+import time
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
+from sky.adaptors import gcp as gcp_adaptor
 from sky.clouds.gcp import GCP
 from sky.clouds.utils import gcp_utils
+from sky.provision.gcp import config as gcp_config
+from sky.provision.gcp import constants
+from sky.utils import common_utils
 
 
 @pytest.mark.parametrize((
@@ -110,3 +120,420 @@ def test_gcp_reservation_is_consumable(specific_reservations,
         zone='zone')
     assert r.is_consumable(
         specific_reservations=specific_reservations) is expected
+
+
+def test_gcp_bootstrap_instances_invalid_node_config():
+    config = MagicMock()
+    config.provider_config = {'project_id': 'proj'}
+    config.node_config = {}
+    with patch.object(gcp_config,
+                      'construct_clients_from_provider_config') as mock_clients:
+        with pytest.raises(ValueError):
+            gcp_config.bootstrap_instances('us-central1', 'cluster', config)
+    mock_clients.assert_not_called()
+
+
+@pytest.fixture
+def clients_cache():
+    gcp_config._CLIENTS_CACHE.clear()
+    yield gcp_config._CLIENTS_CACHE
+    gcp_config._CLIENTS_CACHE.clear()
+
+
+def test_gcp_build_clients_cache(clients_cache, monkeypatch):
+    created = []
+
+    def _mock_create_fn(name):
+
+        def _create(credentials):
+            created.append(name)
+            return name, credentials
+
+        return _create
+
+    for name in ['crm', 'iam', 'compute', 'tpu']:
+        monkeypatch.setattr(gcp_config, f'_create_{name}',
+                            _mock_create_fn(name))
+    get_credentials = MagicMock(side_effect=lambda cred_type, field: field)
+    monkeypatch.setattr(gcp_config.gcp, 'get_credentials', get_credentials)
+
+    clients = gcp_config._build_clients('service_account', 'secret', False)
+    assert clients == (('crm', 'secret'), ('iam', 'secret'), ('compute',
+                                                              'secret'), None)
+    assert gcp_config._build_clients('service_account', 'secret',
+                                     False) is clients
+    assert created == ['crm', 'iam', 'compute']
+    # The raw credentials are not kept as the key of the cache.
+    credentials_hash = hashlib.sha256(b'secret').hexdigest()
+    assert list(clients_cache) == [('service_account', credentials_hash, False)]
+
+    # The clients with and without TPU are cached separately.
+    tpu_clients = gcp_config._build_clients('service_account', 'secret', True)
+    assert tpu_clients[3] == ('tpu', 'secret')
+    assert len(clients_cache) == 2
+    # So are the clients of different credentials.
+    gcp_config._build_clients('service_account', 'other', False)
+    assert len(clients_cache) == 3
+    assert get_credentials.call_count == 3
+
+    # The clients and the credentials are rebuilt after the TTL.
+    clients_cache.expire(time.time() + constants.CLIENTS_CACHE_TTL_SECONDS + 1)
+    assert not clients_cache
+    assert gcp_config._build_clients('service_account', 'secret',
+                                     False) is not clients
+    assert get_credentials.call_count == 4
+
+
+def test_gcp_permission_satisfied_with_existing_bindings():
+    policy = {
+        'bindings': [{
+            'role': 'roles/a',
+            'members': ['serviceAccount:sa@proj.iam.gserviceaccount.com'],
+        }],
+        'etag': 'etag',
+    }
+    service_account = {
+        'projectId': 'proj',
+        'email': 'sa@proj.iam.gserviceaccount.com',
+    }
+    original_policy = copy.deepcopy(policy)
+    crm, iam = MagicMock(), MagicMock()
+    satisfied, new_policy = gcp_config._is_permission_satisfied(
+        service_account, crm, iam, ['a.b.c'], ['roles/a'], policy)
+    assert satisfied
+    assert new_policy == original_policy
+    crm.projects().getIamPolicy.assert_not_called()
+    iam.projects().roles().get.assert_not_called()
+
+
+def test_gcp_permission_satisfied_adds_missing_bindings():
+    member_id = 'serviceAccount:sa@proj.iam.gserviceaccount.com'
+    policy = {
+        'bindings': [
+            {
+                'role': 'roles/a',
+                'members': [member_id],
+            },
+            {
+                'role': 'roles/b',
+                'members': ['user:someone@example.com'],
+            },
+        ],
+        'etag': 'etag',
+    }
+    service_account = {
+        'projectId': 'proj',
+        'email': 'sa@proj.iam.gserviceaccount.com',
+    }
+    iam = MagicMock()
+    iam.projects().roles().get().execute.return_value = {
+        'includedPermissions': []
+    }
+    original_policy = copy.deepcopy(policy)
+    satisfied, new_policy = gcp_config._is_permission_satisfied(
+        service_account, MagicMock(), iam, ['a.b.c'],
+        ['roles/a', 'roles/b', 'roles/c'], policy)
+    assert not satisfied
+    assert new_policy != original_policy
+    assert new_policy['etag'] == original_policy['etag']
+    assert new_policy['bindings'] == [
+        {
+            'role': 'roles/a',
+            'members': [member_id],
+        },
+        {
+            'role': 'roles/b',
+            'members': ['user:someone@example.com', member_id],
+        },
+        {
+            'role': 'roles/c',
+            'members': [member_id],
+        },
+    ]
+
+
+def _mock_iam_clients(bound_roles):
+    email = constants.SKYPILOT_SERVICE_ACCOUNT_EMAIL_TEMPLATE.format(
+        account_id=constants.SKYPILOT_SERVICE_ACCOUNT_ID, project_id='proj')
+    crm, iam = MagicMock(), MagicMock()
+    iam.projects().serviceAccounts().get().execute.return_value = {
+        'projectId': 'proj',
+        'email': email,
+    }
+    iam.projects().roles().get().execute.return_value = {
+        'includedPermissions': []
+    }
+    policy = {
+        'bindings': [{
+            'role': role,
+            'members': [f'serviceAccount:{email}'],
+        } for role in bound_roles],
+        'etag': 'etag',
+    }
+    # Each getIamPolicy call returns a new policy, as the API does.
+    crm.projects().getIamPolicy().execute.side_effect = (
+        lambda: copy.deepcopy(policy))
+    return crm, iam
+
+
+@pytest.mark.parametrize('bound_roles, expect_set_iam_policy', [
+    (constants.DEFAULT_SERVICE_ACCOUNT_ROLES, False),
+    (constants.DEFAULT_SERVICE_ACCOUNT_ROLES[1:], True),
+])
+def test_gcp_configure_iam_role_set_iam_policy(bound_roles,
+                                               expect_set_iam_policy):
+    crm, iam = _mock_iam_clients(bound_roles)
+    config = MagicMock()
+    config.provider_config = {'project_id': 'proj'}
+    with patch.object(gcp_utils,
+                      'get_minimal_permissions',
+                      return_value=['a.b.c']):
+        iam_role = gcp_config._configure_iam_role(config,
+                                                  crm,
+                                                  iam,
+                                                  has_tpu=False)
+    assert iam_role['serviceAccounts'][0]['email'].startswith(
+        constants.SKYPILOT_SERVICE_ACCOUNT_ID)
+    set_iam_policy = crm.projects().setIamPolicy
+    if expect_set_iam_policy:
+        set_iam_policy.assert_called_once()
+        policy = set_iam_policy.call_args[1]['body']['policy']
+        assert policy['etag'] == 'etag'
+        assert len(policy['bindings']) == len(
+            constants.DEFAULT_SERVICE_ACCOUNT_ROLES)
+    else:
+        set_iam_policy.assert_not_called()
+
+
+def test_gcp_discovery_disk_cache_ttl(tmp_path):
+    cache = gcp_config._DiscoveryDiskCache(str(tmp_path), ttl_seconds=60)
+    url = 'https://tpu.googleapis.com/$discovery/rest?version=v2alpha'
+    assert cache.get(url) is None
+    cache.set(url, '{"name": "tpu"}')
+    assert cache.get(url) == '{"name": "tpu"}'
+    # A different url is cached separately.
+    assert cache.get(url + '1') is None
+    # Expire the document by moving its mtime back past the TTL.
+    path = cache._path(url)
+    old_time = time.time() - 120
+    os.utime(path, (old_time, old_time))
+    assert cache.get(url) is None
+
+
+def test_gcp_discovery_disk_cache_set_is_atomic(tmp_path):
+    cache = gcp_config._DiscoveryDiskCache(str(tmp_path / 'cache'),
+                                           ttl_seconds=60)
+    url = 'https://tpu.googleapis.com/$discovery/rest?version=v2alpha'
+    cache_file_name = os.path.basename(cache._path(url))
+    cache.set(url, 'old')
+    cache.set(url, 'new')
+    assert cache.get(url) == 'new'
+    assert os.listdir(tmp_path / 'cache') == [cache_file_name]
+
+    # A failed write keeps the previous document and leaves no temporary file.
+    with patch('os.replace', side_effect=OSError('failed')):
+        cache.set(url, 'newer')
+    assert cache.get(url) == 'new'
+    assert os.listdir(tmp_path / 'cache') == [cache_file_name]
+
+
+def test_gcp_get_project_cache(monkeypatch):
+    monkeypatch.setattr(gcp_config, '_PROJECT_CACHE', {})
+    crm = MagicMock()
+    execute = crm.projects().get().execute
+    execute.return_value = {
+        'projectId': 'proj',
+        'lifecycleState': 'ACTIVE',
+    }
+
+    # The cache is disabled unless the env var is set.
+    monkeypatch.delenv(constants.CACHE_PROJECT_ENV_VAR, raising=False)
+    gcp_config._get_project('proj', crm, use_cache=True)
+    gcp_config._get_project('proj', crm, use_cache=True)
+    assert execute.call_count == 2
+    assert not gcp_config._PROJECT_CACHE
+
+    monkeypatch.setenv(constants.CACHE_PROJECT_ENV_VAR, '1')
+    gcp_config._get_project('proj', crm, use_cache=True)
+    project = gcp_config._get_project('proj', crm, use_cache=True)
+    assert project['projectId'] == 'proj'
+    assert execute.call_count == 3
+
+    # The cached project is refetched after the TTL.
+    now = time.time()
+    with patch('time.time',
+               return_value=now + constants.PROJECT_CACHE_TTL_SECONDS + 1):
+        gcp_config._get_project('proj', crm, use_cache=True)
+    assert execute.call_count == 4
+
+
+def test_gcp_get_project_cache_only_active(monkeypatch):
+    monkeypatch.setattr(gcp_config, '_PROJECT_CACHE', {})
+    monkeypatch.setenv(constants.CACHE_PROJECT_ENV_VAR, '1')
+    crm = MagicMock()
+    execute = crm.projects().get().execute
+    execute.return_value = {
+        'projectId': 'proj',
+        'lifecycleState': 'DELETE_REQUESTED',
+    }
+    gcp_config._get_project('proj', crm, use_cache=True)
+    gcp_config._get_project('proj', crm, use_cache=True)
+    assert execute.call_count == 2
+    assert 'proj' not in gcp_config._PROJECT_CACHE
+
+
+def _make_subnet(vpc_name: str, subnet_name: str):
+    return {
+        'name': subnet_name,
+        'network': ('https://www.googleapis.com/compute/v1/projects/proj/'
+                    f'global/networks/{vpc_name}'),
+        'selfLink': subnet_name,
+    }
+
+
+@pytest.fixture
+def subnets_cache():
+    gcp_config._SUBNETS_CACHE.clear()
+    yield gcp_config._SUBNETS_CACHE
+    gcp_config._SUBNETS_CACHE.clear()
+
+
+@pytest.mark.usefixtures('subnets_cache')
+def test_gcp_list_subnets_refetches_stale_cache():
+    compute = MagicMock()
+    execute = compute.subnetworks().list().execute
+    subnet_a = _make_subnet('default', 'subnet-a')
+    subnet_b = _make_subnet('my-vpc', 'subnet-b')
+    execute.return_value = {'items': [subnet_a]}
+    assert gcp_config._list_subnets('proj', 'us-central1',
+                                    compute) == [subnet_a]
+
+    # The VPC is created by others after the subnets are cached.
+    execute.return_value = {'items': [subnet_a, subnet_b]}
+    assert gcp_config._list_subnets('proj', 'us-central1',
+                                    compute) == [subnet_a]
+    assert execute.call_count == 1
+    subnets = gcp_config._list_subnets('proj',
+                                       'us-central1',
+                                       compute,
+                                       network='my-vpc')
+    assert subnets == [subnet_b]
+    assert execute.call_count == 2
+    # The refetched subnets are cached.
+    subnets = gcp_config._list_subnets('proj',
+                                       'us-central1',
+                                       compute,
+                                       network='my-vpc')
+    assert subnets == [subnet_b]
+    assert execute.call_count == 2
+
+
+def test_gcp_create_vpc_clears_subnets_cache(subnets_cache, monkeypatch):
+    vpc_name = constants.SKYPILOT_VPC_NAME
+    compute = MagicMock()
+    execute = compute.subnetworks().list().execute
+    execute.return_value = {'items': [_make_subnet('default', 'subnet-a')]}
+    # Cache the subnets before the VPC is created.
+    gcp_config._list_subnets('proj', 'us-central1', compute)
+
+    def _create_vpcnet(project_id, compute, body):
+        del project_id, compute, body  # Unused.
+        execute.return_value = {
+            'items': [
+                _make_subnet('default', 'subnet-a'),
+                _make_subnet(vpc_name, 'subnet-b'),
+            ]
+        }
+
+    monkeypatch.setattr(gcp_config, '_check_firewall_rules',
+                        lambda *args: False)
+    monkeypatch.setattr(gcp_config, '_list_vpcnets', lambda *args, **kw: [])
+    subnets_cache_sizes = []
+    monkeypatch.setattr(
+        gcp_config, '_create_rules',
+        lambda *args: subnets_cache_sizes.append(len(subnets_cache)))
+    monkeypatch.setattr(gcp_config, '_create_vpcnet', _create_vpcnet)
+    config = MagicMock()
+    config.provider_config = {'project_id': 'proj'}
+    usable_vpc_name, subnet = gcp_config.get_usable_vpc_and_subnet(
+        'cluster', 'us-central1', config, compute)
+    assert usable_vpc_name == vpc_name
+    assert subnet == _make_subnet(vpc_name, 'subnet-b')
+    # The cache is cleared right after the VPC is created.
+    assert subnets_cache_sizes == [0]
+    assert execute.call_count == 2
+
+
+def test_gcp_get_credentials_from_key_file_or_json(tmp_path):
+    # pylint: disable=import-outside-toplevel
+    from google.oauth2 import service_account
+
+    key_info = {'type': 'service_account', 'project_id': 'proj'}
+    key_path = tmp_path / 'key.json'
+    key_path.write_text(json.dumps(key_info))
+    credentials_cls = service_account.Credentials
+    with patch.object(credentials_cls,
+                      'from_service_account_file') as mock_from_file:
+        with patch.object(credentials_cls,
+                          'from_service_account_info') as mock_from_info:
+            # A path to the key file.
+            credentials = gcp_adaptor.get_credentials('service_account',
+                                                      str(key_path))
+            assert credentials is mock_from_file.return_value
+            mock_from_file.assert_called_once_with(str(key_path))
+            mock_from_info.assert_not_called()
+
+            # The content of the key file.
+            mock_from_file.reset_mock()
+            credentials = gcp_adaptor.get_credentials('service_account',
+                                                      json.dumps(key_info))
+            assert credentials is mock_from_info.return_value
+            mock_from_info.assert_called_once_with(key_info)
+            mock_from_file.assert_not_called()
+
+
+class _FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_gcp_wait_for_crm_operation_stops_on_done():
+    clock = _FakeClock()
+    crm = MagicMock()
+    execute = crm.operations().get().execute
+    execute.side_effect = [{'done': False}, {'done': False}, {'done': True}]
+    with patch('time.time', clock.time), patch('time.sleep', clock.sleep):
+        result = gcp_config.wait_for_crm_operation({'name': 'op'}, crm)
+    assert result == {'done': True}
+    assert execute.call_count == 3
+    assert len(clock.sleeps) == 2
+    # The backoff starts with a short interval.
+    assert clock.sleeps[0] < constants.POLL_INTERVAL
+
+
+def test_gcp_wait_for_crm_operation_stops_on_deadline():
+    clock = _FakeClock()
+    start = clock.now
+    crm = MagicMock()
+    execute = crm.operations().get().execute
+    execute.return_value = {'done': False}
+    with patch('time.time', clock.time), patch('time.sleep', clock.sleep):
+        result = gcp_config.wait_for_crm_operation({'name': 'op'}, crm)
+    assert result == {'done': False}
+    # The last sleep is cut short to end exactly at the deadline.
+    assert clock.now - start == pytest.approx(constants.MAX_POLLS *
+                                              constants.POLL_INTERVAL)
+    assert execute.call_count == len(clock.sleeps) + 1
+    # The backoff is capped, plus the jitter.
+    max_backoff = (constants.OPERATION_POLL_INITIAL_BACKOFF_SECONDS *
+                   constants.OPERATION_POLL_MAX_BACKOFF_FACTOR)
+    assert max(clock.sleeps) <= max_backoff * (1 + common_utils.Backoff.JITTER)